@@ -1,35 +1,112 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Request
 import time
-from fastapi.responses import RedirectResponse, JSONResponse
+from typing import List
+from fastapi.responses import RedirectResponse, JSONResponse, StreamingResponse
 from utility import (
     load_model,
+    compile_engine,
+    artifact_version,
     preprocess_input,
+    preprocess_batch,
+    build_prediction_response,
+    MicroBatcher,
+    InferenceExecutor,
+    PredictionCache,
+    iter_ndjson_lines,
+    LineTooLongError,
     trace_span,
     setup_logging,
     reqs_counter,
     latency_hist,
 )
 from dto import PatientRecordDTO, PredictionResponse
+from pydantic import ValidationError
 from loguru import logger
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
+import json
+import numpy as np
 import os
 
 setup_logging()
 
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "50000"))
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "1000"))
+STREAM_MAX_LINE_BYTES = int(os.getenv("STREAM_MAX_LINE_BYTES", "65536"))
+
 model = None
 scaler = None
+engine = None
+batcher = None
+executor = None
+cache = None
+
+
+async def _score_uncached(features):
+    if batcher and features.shape[0] == 1:
+        return np.array([await batcher.submit(features)])
+    return await executor.score(features)
+
+
+async def score_features(features):
+    """
+    Score a preprocessed feature matrix with the compiled engine of the loaded artifacts.
+    Rows found in the prediction cache are not scored again.
+    """
+    if cache is None:
+        return await _score_uncached(features)
+
+    scores, missing = cache.get_many(features)
+    if missing.any():
+        computed = await _score_uncached(features[missing])
+        scores[missing] = computed
+        cache.put_many(features[missing], computed)
+    return scores
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global model, scaler
+    global model, scaler, engine, batcher, executor, cache
+
+    model_path = os.getenv("MODEL_PATH", "model/model.pkl")
+    scaler_path = os.getenv("SCALER_PATH", "model/scaler.pkl")
 
     logger.info("Loading the model and scaler...")
-    model = await load_model(os.getenv("MODEL_PATH", "model/model.pkl"))
-    scaler = await load_model(os.getenv("SCALER_PATH", "model/scaler.pkl"))
+    model = await load_model(model_path)
+    scaler = await load_model(scaler_path)
+    engine = compile_engine(model, scaler)
+
+    pool_size = os.getenv("INFERENCE_POOL_SIZE")
+    executor = InferenceExecutor(
+        mode=os.getenv("INFERENCE_EXECUTOR", "thread").lower(),
+        pool_size=int(pool_size) if pool_size else None,
+    )
+    executor.start(engine, model_path, scaler_path)
+
+    cache_max_entries = int(os.getenv("PREDICTION_CACHE_MAX_ENTRIES", "10000"))
+    if cache_max_entries > 0:
+        cache = PredictionCache(
+            max_entries=cache_max_entries,
+            ttl_seconds=float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "300")),
+        )
+        cache.bind(artifact_version(model_path, scaler_path))
+
+    if os.getenv("ENABLE_MICRO_BATCHING", "false").lower() == "true":
+        batcher = MicroBatcher(
+            score_fn=executor.score,
+            max_batch_size=int(os.getenv("MICRO_BATCH_MAX_SIZE", "32")),
+            max_wait_ms=float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "2")),
+        )
+        await batcher.start()
     yield
     logger.info("Shutting down the application...")
+    if batcher:
+        await batcher.stop()
+    executor.shutdown()
+    batcher = None
+    executor = None
+    cache = None
+    engine = None
     model = None
     scaler = None
 
@@ -72,21 +149,12 @@ async def predict(patient_record: PatientRecordDTO) -> JSONResponse:
         # Convert DTO to model input format
         preprocessed_input = await preprocess_input(patient_record)
 
-        # Standardize the input data
-        model_input = scaler.transform(preprocessed_input)
-
-        # Perform prediction
-        prediction = model.predict_proba(model_input)[:, 1][0]
+        # Standardize the input data and perform prediction, sharing a single
+        # model call with concurrent requests when micro-batching is enabled
+        prediction = (await score_features(preprocessed_input))[0]
 
         # Create response
-        response = PredictionResponse(
-            risk_level="low_risk"
-            if prediction < 0.33
-            else "medium_risk"
-            if prediction < 0.66
-            else "high_risk",
-            risk_score=round(prediction * 100.0, 2),
-        )
+        response = build_prediction_response(prediction)
 
         logger.info("Prediction result: {}", response)
 
@@ -100,6 +168,126 @@ async def predict(patient_record: PatientRecordDTO) -> JSONResponse:
         latency_hist.record(time.time() - start, label)
 
 
+@app.post("/predict/batch", response_model=List[PredictionResponse])
+@trace_span("batch_prediction_process")
+async def predict_batch(
+    patient_records: List[PatientRecordDTO],
+) -> List[PredictionResponse]:
+    """
+    Predict the risk level and score for a list of patient records in one model call.
+
+    Args:
+        patient_records (List[PatientRecordDTO]): The patient records to score.
+
+    Returns:
+        List[PredictionResponse]: One prediction result per record, in input order.
+    """
+    logger.info("Received {} patient records for prediction", len(patient_records))
+    if len(patient_records) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch size exceeds the limit of {MAX_BATCH_SIZE} records",
+        )
+
+    start = time.time()
+    label = {"endpoint": "predict_batch", "result": "sucessful"}
+    try:
+        if not patient_records:
+            return []
+
+        # Build a single N x D matrix so the scaler and model run once
+        preprocessed_input = await executor.run(preprocess_batch, patient_records)
+        predictions = await score_features(preprocessed_input)
+
+        return [build_prediction_response(prediction) for prediction in predictions]
+    except Exception as e:
+        logger.error("Error during batch prediction: {}", e)
+        label["result"] = "failed"
+        raise
+    finally:
+        reqs_counter.add(1, label)
+        latency_hist.record(time.time() - start, label)
+
+
+async def _score_ndjson_stream(request: Request):
+    """
+    Score newline-delimited patient records from the request body in fixed-size chunks
+    and yield one NDJSON line per input record, in input order. Invalid records yield
+    an error line instead of failing the whole stream.
+    """
+    start = time.time()
+    label = {"endpoint": "predict_stream", "result": "sucessful"}
+    # Entries are either a validated record or the error line for an invalid one
+    pending = []
+    pending_records = []
+
+    async def flush():
+        predictions = []
+        if pending_records:
+            preprocessed_input = await executor.run(preprocess_batch, pending_records)
+            predictions = iter(await score_features(preprocessed_input))
+
+        lines = [
+            json.dumps(
+                build_prediction_response(next(predictions)).model_dump()
+                if entry is None
+                else entry
+            )
+            for entry in pending
+        ]
+        pending.clear()
+        pending_records.clear()
+        return "\n".join(lines) + "\n"
+
+    try:
+        async for line_number, line in iter_ndjson_lines(
+            request.stream(), STREAM_MAX_LINE_BYTES
+        ):
+            try:
+                pending_records.append(PatientRecordDTO.model_validate_json(line))
+                pending.append(None)
+            except ValidationError as e:
+                pending.append(
+                    {
+                        "line": line_number,
+                        "detail": e.errors(include_url=False, include_context=False),
+                    }
+                )
+
+            if len(pending_records) >= STREAM_CHUNK_SIZE:
+                yield await flush()
+
+        if pending:
+            yield await flush()
+    except LineTooLongError as e:
+        logger.error("Rejected stream prediction: {}", e)
+        label["result"] = "failed"
+        yield json.dumps({"detail": str(e)}) + "\n"
+    except Exception as e:
+        logger.error("Error during stream prediction: {}", e)
+        label["result"] = "failed"
+        yield json.dumps({"detail": "Server Error"}) + "\n"
+    finally:
+        reqs_counter.add(1, label)
+        latency_hist.record(time.time() - start, label)
+
+
+@app.post("/predict/stream")
+@trace_span("stream_prediction_process")
+async def predict_stream(request: Request) -> StreamingResponse:
+    """
+    Predict the risk level and score for an unbounded stream of newline-delimited JSON
+    patient records. Records are read incrementally and scored in vectorized chunks of
+    STREAM_CHUNK_SIZE, so memory stays constant regardless of the upload size.
+
+    Returns:
+        StreamingResponse: One NDJSON prediction result or error per input record.
+    """
+    return StreamingResponse(
+        _score_ndjson_stream(request), media_type="application/x-ndjson"
+    )
+
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(
     request: Request, exc: RequestValidationError
@@ -1,4 +1,23 @@
-from .model_utils import load_model, preprocess_input
+from .model_utils import (
+    load_model,
+    preprocess_input,
+    preprocess_batch,
+    compile_engine,
+    artifact_version,
+    build_parity_corpus,
+    verify_engine_parity,
+)
+from .engine_utils import (
+    SklearnEngine,
+    FusedLinearEngine,
+    TreeEnsembleEngine,
+    SVCEngine,
+)
+from .inference_utils import predict_scores, build_prediction_response
+from .batching_utils import MicroBatcher
+from .executor_utils import InferenceExecutor
+from .cache_utils import PredictionCache
+from .stream_utils import iter_ndjson_lines, LineTooLongError
 from .tracing_utils import init_tracer, trace_span
 from .logging_utils import setup_logging
 from .metric_utils import reqs_counter, latency_hist
@@ -8,6 +27,22 @@ __version__ = "0.1.0"
 __all__ = [
     "load_model",
     "preprocess_input",
+    "preprocess_batch",
+    "compile_engine",
+    "artifact_version",
+    "build_parity_corpus",
+    "verify_engine_parity",
+    "SklearnEngine",
+    "FusedLinearEngine",
+    "TreeEnsembleEngine",
+    "SVCEngine",
+    "predict_scores",
+    "build_prediction_response",
+    "MicroBatcher",
+    "InferenceExecutor",
+    "PredictionCache",
+    "iter_ndjson_lines",
+    "LineTooLongError",
     "init_tracer",
     "trace_span",
     "setup_logging",
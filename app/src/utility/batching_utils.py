@@ -0,0 +1,126 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
+from loguru import logger
+import numpy as np
+from numpy.typing import NDArray
+from .metric_utils import batch_size_hist, queue_wait_hist
+
+ScoreFn = Callable[[NDArray[np.float64]], Awaitable[NDArray[np.float64]]]
+
+
+class MicroBatcher:
+    """
+    Gather concurrent single-record predictions and score them as one vectorized call.
+
+    Each caller submits a 1 x D feature row and awaits a future that resolves to the
+    score of its own row. A batch is flushed as soon as it holds max_batch_size rows
+    or the oldest row has waited max_wait_ms, whichever comes first.
+    """
+
+    def __init__(self, score_fn: ScoreFn, max_batch_size: int, max_wait_ms: float):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must not be negative")
+
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: List[Tuple[NDArray[np.float64], asyncio.Future, float]] = []
+
+    async def start(self):
+        """
+        Start the background task that drains the queue. Must run inside the event loop.
+        """
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            "Micro-batching started with max_batch_size={} and max_wait_ms={}",
+            self.max_batch_size,
+            self.max_wait * 1000.0,
+        )
+
+    async def stop(self):
+        """
+        Stop the background task and fail every request still waiting in the queue.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        pending = self._inflight
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future, _ in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Micro-batcher has been stopped"))
+        self._inflight = []
+        logger.info("Micro-batching stopped.")
+
+    async def submit(self, features: NDArray[np.float64]) -> float:
+        """
+        Queue a single preprocessed record and wait for its score.
+
+        Args:
+            features (NDArray[np.float64]): A 1 x D feature row.
+
+        Returns:
+            float: The positive class probability of the submitted row.
+        """
+        if self._worker is None:
+            raise RuntimeError("Micro-batcher is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((features, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> List[Tuple[NDArray[np.float64], asyncio.Future, float]]:
+        batch = [await self._queue.get()]
+        deadline = batch[0][2] + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = self._inflight = await self._collect()
+            flushed_at = time.perf_counter()
+
+            if batch_size_hist:
+                batch_size_hist.record(len(batch))
+            if queue_wait_hist:
+                for _, _, enqueued_at in batch:
+                    queue_wait_hist.record(flushed_at - enqueued_at)
+
+            try:
+                scores = await self.score_fn(np.vstack([row for row, _, _ in batch]))
+            except Exception as e:
+                logger.error("Error while scoring micro-batch: {}", e)
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future, _), score in zip(batch, scores):
+                if not future.done():
+                    future.set_result(score)
+            self._inflight = []
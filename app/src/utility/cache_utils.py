@@ -0,0 +1,122 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+from loguru import logger
+import numpy as np
+from numpy.typing import NDArray
+from .metric_utils import (
+    cache_hits_counter,
+    cache_misses_counter,
+    cache_evictions_counter,
+)
+
+
+class PredictionCache:
+    """
+    Bounded in-process LRU cache of prediction scores keyed on the canonical feature vector.
+
+    Entries expire after ttl_seconds, and the whole cache is dropped whenever it is bound
+    to a different artifact version, so a new model or scaler never serves stale scores.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.version: Optional[str] = None
+        self._entries: "OrderedDict[bytes, Tuple[float, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(row: NDArray[np.float64]) -> bytes:
+        # Adding 0.0 turns -0.0 into 0.0 so both spellings share an entry
+        return (np.ascontiguousarray(row, dtype=np.float64) + 0.0).tobytes()
+
+    def _evicted(self, count: int, reason: str):
+        if count and cache_evictions_counter:
+            cache_evictions_counter.add(count, {"reason": reason})
+
+    def bind(self, version: str):
+        """
+        Bind the cache to an artifact version, clearing it if the version changed.
+
+        Args:
+            version (str): The fingerprint of the model and scaler artifacts in use.
+        """
+        if version != self.version:
+            if self._entries:
+                logger.info(
+                    "Artifact version changed from {} to {}. Clearing prediction cache.",
+                    self.version,
+                    version,
+                )
+            self.clear()
+            self.version = version
+
+    def clear(self):
+        self._evicted(len(self._entries), "invalidated")
+        self._entries.clear()
+
+    def get_many(
+        self, features: NDArray[np.float64]
+    ) -> Tuple[NDArray[np.float64], NDArray[np.bool_]]:
+        """
+        Look up every row of a feature matrix.
+
+        Args:
+            features (NDArray[np.float64]): The N x D matrix of preprocessed records.
+
+        Returns:
+            Tuple[NDArray[np.float64], NDArray[np.bool_]]: The cached scores, NaN where
+            missing, and a mask of the rows that still have to be scored.
+        """
+        now = self.clock()
+        scores = np.full(features.shape[0], np.nan)
+        expired = 0
+
+        for i, row in enumerate(features):
+            key = self._key(row)
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            if entry[1] <= now:
+                del self._entries[key]
+                expired += 1
+                continue
+            self._entries.move_to_end(key)
+            scores[i] = entry[0]
+
+        missing = np.isnan(scores)
+        hits = int(features.shape[0] - missing.sum())
+        if cache_hits_counter and hits:
+            cache_hits_counter.add(hits)
+        if cache_misses_counter and hits < features.shape[0]:
+            cache_misses_counter.add(features.shape[0] - hits)
+        self._evicted(expired, "expired")
+        return scores, missing
+
+    def put_many(self, features: NDArray[np.float64], scores: NDArray[np.float64]):
+        """
+        Store the scores of every row of a feature matrix, evicting the least recently
+        used entries beyond max_entries.
+        """
+        expires_at = self.clock() + self.ttl_seconds
+        for row, score in zip(features, scores):
+            key = self._key(row)
+            self._entries[key] = (float(score), expires_at)
+            self._entries.move_to_end(key)
+
+        overflow = len(self._entries) - self.max_entries
+        for _ in range(max(overflow, 0)):
+            self._entries.popitem(last=False)
+        self._evicted(max(overflow, 0), "capacity")
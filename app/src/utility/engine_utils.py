@@ -0,0 +1,319 @@
+from loguru import logger
+import os
+import numpy as np
+from numpy.typing import NDArray
+from sklearn.dummy import DummyClassifier
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+from .inference_utils import predict_scores
+
+
+def _sigmoid(logits: NDArray[np.float64]) -> NDArray[np.float64]:
+    # exp overflows to inf for very negative logits, which correctly yields 0.0
+    with np.errstate(over="ignore"):
+        return 1.0 / (1.0 + np.exp(-logits))
+
+
+def _scaler_moments(scaler: StandardScaler):
+    """
+    Return the mean and scale applied by a fitted StandardScaler as float64 vectors.
+    """
+    n_features = scaler.n_features_in_
+    mean = (
+        np.zeros(n_features)
+        if scaler.mean_ is None or not scaler.with_mean
+        else np.asarray(scaler.mean_, dtype=np.float64)
+    )
+    scale = (
+        np.ones(n_features)
+        if scaler.scale_ is None or not scaler.with_std
+        else np.asarray(scaler.scale_, dtype=np.float64)
+    )
+    return mean, scale
+
+
+class SklearnEngine:
+    """
+    Reference engine that scores through the scaler's transform and the model's predict_proba.
+    """
+
+    name = "sklearn"
+
+    def __init__(self, model, scaler):
+        self.model = model
+        self.scaler = scaler
+
+    def predict_scores(self, features: NDArray[np.float64]) -> NDArray[np.float64]:
+        return predict_scores(self.model, self.scaler, features)
+
+
+class FusedLinearEngine:
+    """
+    Score a binary LogisticRegression trained on StandardScaler output as a single dot
+    product plus a sigmoid, with the scaler folded into the weights at load time:
+
+        sigmoid(((x - mean) / scale) . coef + intercept)
+            = sigmoid(x . (coef / scale) + (intercept - mean . (coef / scale)))
+    """
+
+    name = "fused_linear"
+
+    @staticmethod
+    def supports(model, scaler) -> bool:
+        return (
+            isinstance(model, LogisticRegression)
+            and isinstance(scaler, StandardScaler)
+            and len(model.classes_) == 2
+            and model.coef_.shape == (1, scaler.n_features_in_)
+        )
+
+    def __init__(self, model: LogisticRegression, scaler: StandardScaler):
+        mean, scale = _scaler_moments(scaler)
+        self.weights = np.ascontiguousarray(model.coef_[0] / scale, dtype=np.float64)
+        self.bias = float(model.intercept_[0] - mean @ self.weights)
+        logger.debug("Fused linear engine compiled with bias {}", self.bias)
+
+    def predict_scores(self, features: NDArray[np.float64]) -> NDArray[np.float64]:
+        return _sigmoid(features @ self.weights + self.bias)
+
+
+class TreeEnsembleEngine:
+    """
+    Score a binary RandomForestClassifier or GradientBoostingClassifier by flattening
+    every fitted tree into contiguous NumPy arrays at load time, then walking all trees
+    for the whole batch together, one tree level per step.
+
+    Leaves point to themselves, so rows that reach a leaf early stay there while the
+    remaining rows descend, and max_depth steps always land every row on a leaf.
+    Batches larger than TREE_ENGINE_MAX_ROWS go through sklearn, whose compiled
+    per-tree traversal is faster once the batch amortizes its fixed overhead.
+    """
+
+    name = "tree_ensemble"
+
+    @staticmethod
+    def supports(model, scaler) -> bool:
+        if not isinstance(scaler, StandardScaler) or len(model.classes_) != 2:
+            return False
+        if isinstance(model, RandomForestClassifier):
+            return True
+        return (
+            isinstance(model, GradientBoostingClassifier)
+            and model.loss == "log_loss"
+            and model.estimators_.shape[1] == 1
+            and (model.init_ == "zero" or isinstance(model.init_, DummyClassifier))
+        )
+
+    def __init__(self, model, scaler: StandardScaler):
+        self.reference = SklearnEngine(model, scaler)
+        self.max_rows = int(os.getenv("TREE_ENGINE_MAX_ROWS", "128"))
+        self.mean, self.scale = _scaler_moments(scaler)
+        self.n_features = self.mean.shape[0]
+
+        if isinstance(model, RandomForestClassifier):
+            trees = [estimator.tree_ for estimator in model.estimators_]
+            leaf_values = [self._positive_class_fraction(tree) for tree in trees]
+            self.is_boosted = False
+        else:
+            trees = [estimator.tree_ for estimator in model.estimators_[:, 0]]
+            leaf_values = [tree.value[:, 0, 0] for tree in trees]
+            self.is_boosted = True
+            self.learning_rate = float(model.learning_rate)
+            # The prior of the init estimator is the same for every row
+            self.init_raw = float(
+                model._raw_predict_init(np.zeros((1, self.n_features)))[0, 0]
+            )
+
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        self.n_trees = len(trees)
+        self.roots = offsets[:-1].astype(np.intp)
+        self.max_depth = max(tree.max_depth for tree in trees)
+
+        feature, threshold, left, right = [], [], [], []
+        for offset, tree in zip(offsets, trees):
+            is_leaf = tree.children_left == -1
+            nodes = np.arange(tree.node_count) + offset
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            left.append(np.where(is_leaf, nodes, tree.children_left + offset))
+            right.append(np.where(is_leaf, nodes, tree.children_right + offset))
+
+        self.feature = np.ascontiguousarray(np.concatenate(feature), dtype=np.intp)
+        self.threshold = np.ascontiguousarray(
+            np.concatenate(threshold), dtype=np.float64
+        )
+        # Children interleaved as [right, left] so the next node is children[2 * node + go_left]
+        self.children = np.empty(2 * self.feature.shape[0], dtype=np.intp)
+        self.children[0::2] = np.concatenate(right)
+        self.children[1::2] = np.concatenate(left)
+        self.value = np.ascontiguousarray(np.concatenate(leaf_values), dtype=np.float64)
+        logger.debug(
+            "Tree ensemble engine compiled with {} trees, {} nodes and depth {}",
+            self.n_trees,
+            self.value.shape[0],
+            self.max_depth,
+        )
+
+    @staticmethod
+    def _positive_class_fraction(tree) -> NDArray[np.float64]:
+        values = tree.value[:, 0, :]
+        normalizer = values.sum(axis=1)
+        normalizer[normalizer == 0.0] = 1.0
+        return values[:, 1] / normalizer
+
+    def apply(self, features: NDArray[np.float64]) -> NDArray[np.intp]:
+        """
+        Return the flattened leaf index reached by every row in every tree, as N x T.
+        """
+        # sklearn trees compare float32 inputs against float64 thresholds
+        scaled = ((features - self.mean) / self.scale).astype(np.float32).ravel()
+        row_offsets = (np.arange(features.shape[0]) * self.n_features)[:, None]
+        nodes = np.broadcast_to(self.roots, (features.shape[0], self.n_trees))
+
+        for _ in range(self.max_depth):
+            go_left = scaled[row_offsets + self.feature[nodes]] <= self.threshold[nodes]
+            nodes = self.children[2 * nodes + go_left]
+        return nodes
+
+    def predict_scores(self, features: NDArray[np.float64]) -> NDArray[np.float64]:
+        if features.shape[0] > self.max_rows:
+            return self.reference.predict_scores(features)
+
+        leaf_values = self.value[self.apply(features)]
+        if self.is_boosted:
+            return _sigmoid(
+                self.init_raw + self.learning_rate * leaf_values.sum(axis=1)
+            )
+        return leaf_values.sum(axis=1) / self.n_trees
+
+
+# Bounds and tolerance used by libsvm when coupling pairwise probabilities
+LIBSVM_MIN_PROBABILITY = 1e-7
+LIBSVM_COUPLING_MAX_ITER = 100
+LIBSVM_COUPLING_EPS = 0.005 / 2
+
+
+def _libsvm_sigmoid(decision, prob_a: float, prob_b: float) -> NDArray[np.float64]:
+    f_apb = decision * prob_a + prob_b
+    with np.errstate(over="ignore"):
+        positive = np.exp(-np.abs(f_apb))
+        return np.where(
+            f_apb >= 0, positive / (1.0 + positive), 1.0 / (1.0 + np.exp(f_apb))
+        )
+
+
+def _couple_binary_probabilities(r01: NDArray[np.float64]) -> NDArray[np.float64]:
+    """
+    Reproduce libsvm's multiclass_probability for two classes, vectorized over rows.
+
+    libsvm solves the pairwise coupling problem iteratively even for two classes and
+    stops once the error drops below its tolerance, so the result is close to, but
+    not exactly, the pairwise probability. Each row stops iterating on its own.
+
+    Args:
+        r01 (NDArray[np.float64]): The clipped probability that the first class wins.
+
+    Returns:
+        NDArray[np.float64]: The coupled probability of the second class.
+    """
+    r10 = 1.0 - r01
+    q00, q01, q11 = r10 * r10, -r10 * r01, r01 * r01
+    p0 = np.full(r01.shape[0], 0.5)
+    p1 = np.full(r01.shape[0], 0.5)
+    active = np.arange(r01.shape[0])
+
+    for _ in range(LIBSVM_COUPLING_MAX_ITER):
+        a0, a1 = p0[active], p1[active]
+        aq00, aq01, aq11 = q00[active], q01[active], q11[active]
+        qp0 = aq00 * a0 + aq01 * a1
+        qp1 = aq01 * a0 + aq11 * a1
+        pqp = a0 * qp0 + a1 * qp1
+
+        keep = np.maximum(np.abs(qp0 - pqp), np.abs(qp1 - pqp)) >= LIBSVM_COUPLING_EPS
+        if not keep.any():
+            break
+        active = active[keep]
+        a0, a1, qp0, qp1, pqp = a0[keep], a1[keep], qp0[keep], qp1[keep], pqp[keep]
+        aq00, aq01, aq11 = aq00[keep], aq01[keep], aq11[keep]
+
+        # Same update order as libsvm: the class 0 coordinate first, then class 1.
+        # Qp and pQp are recomputed from p at the start of every iteration, so only
+        # the class 0 step needs to carry them forward.
+        diff = (pqp - qp0) / aq00
+        a0 = a0 + diff
+        pqp = (pqp + diff * (diff * aq00 + 2 * qp0)) / (1 + diff) / (1 + diff)
+        qp1 = (qp1 + diff * aq01) / (1 + diff)
+        a0, a1 = a0 / (1 + diff), a1 / (1 + diff)
+
+        diff = (pqp - qp1) / aq11
+        a1 = a1 + diff
+        a0, a1 = a0 / (1 + diff), a1 / (1 + diff)
+
+        p0[active], p1[active] = a0, a1
+
+    return p1
+
+
+class SVCEngine:
+    """
+    Score a binary RBF-kernel SVC(probability=True) in NumPy. Support vector norms are
+    computed at load time, so the kernel against every support vector costs a single
+    matrix multiply per batch:
+
+        ||x - sv||^2 = ||x||^2 + ||sv||^2 - 2 x . sv
+
+    The decision values then go through the stored probA_/probB_ Platt sigmoid and
+    libsvm's pairwise coupling, as in predict_proba.
+    """
+
+    name = "svc_rbf"
+
+    @staticmethod
+    def supports(model, scaler) -> bool:
+        return (
+            isinstance(model, SVC)
+            and isinstance(scaler, StandardScaler)
+            and model.kernel == "rbf"
+            and model.probability
+            and len(model.classes_) == 2
+            and not model._sparse
+        )
+
+    def __init__(self, model: SVC, scaler: StandardScaler):
+        self.mean, self.scale = _scaler_moments(scaler)
+        support_vectors = np.asarray(model.support_vectors_, dtype=np.float64)
+        self.support_vectors_t = np.ascontiguousarray(support_vectors.T)
+        self.support_norms = np.einsum("ij,ij->i", support_vectors, support_vectors)
+        self.gamma = float(model._gamma)
+        # libsvm's internal sign convention, before sklearn flips it for binary problems
+        self.dual_coef = np.ascontiguousarray(model._dual_coef_[0], dtype=np.float64)
+        self.intercept = float(model._intercept_[0])
+        self.prob_a = float(model.probA_[0])
+        self.prob_b = float(model.probB_[0])
+        logger.debug(
+            "SVC engine compiled with {} support vectors", support_vectors.shape[0]
+        )
+
+    def decision_values(self, features: NDArray[np.float64]) -> NDArray[np.float64]:
+        scaled = (features - self.mean) / self.scale
+        distances = (
+            np.einsum("ij,ij->i", scaled, scaled)[:, None]
+            + self.support_norms
+            - 2.0 * (scaled @ self.support_vectors_t)
+        )
+        np.maximum(distances, 0.0, out=distances)
+        kernel = np.exp(-self.gamma * distances)
+        return kernel @ self.dual_coef + self.intercept
+
+    def predict_scores(self, features: NDArray[np.float64]) -> NDArray[np.float64]:
+        r01 = np.clip(
+            _libsvm_sigmoid(self.decision_values(features), self.prob_a, self.prob_b),
+            LIBSVM_MIN_PROBABILITY,
+            1.0 - LIBSVM_MIN_PROBABILITY,
+        )
+        return _couple_binary_probabilities(r01)
+
+
+COMPILED_ENGINES = [FusedLinearEngine, TreeEnsembleEngine, SVCEngine]
@@ -0,0 +1,115 @@
+import asyncio
+import contextvars
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Optional
+from loguru import logger
+import joblib
+import numpy as np
+from numpy.typing import NDArray
+from .model_utils import compile_engine
+
+EXECUTOR_MODES = ("inline", "thread", "process")
+
+# Engine compiled once per worker process by the process pool initializer
+_worker_engine = None
+
+
+def _init_worker(model_path: str, scaler_path: str):
+    """
+    Load the model and scaler into a process pool worker and compile its engine.
+    """
+    global _worker_engine
+
+    _worker_engine = compile_engine(joblib.load(model_path), joblib.load(scaler_path))
+
+
+def _score_in_worker(features: NDArray[np.float64]) -> NDArray[np.float64]:
+    return _worker_engine.predict_scores(features)
+
+
+class InferenceExecutor:
+    """
+    Run preprocessing and model scoring inline, in a thread pool or in a process pool,
+    so CPU-bound work does not have to block the asyncio event loop.
+    """
+
+    def __init__(self, mode: str = "thread", pool_size: Optional[int] = None):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(
+                f"Unknown executor mode '{mode}', expected one of {EXECUTOR_MODES}"
+            )
+
+        self.mode = mode
+        self.pool_size = pool_size or min(4, os.cpu_count() or 1)
+        self._pool: Optional[Executor] = None
+        self._engine = None
+
+    def start(self, engine, model_path: str, scaler_path: str):
+        """
+        Bind the compiled engine and start the worker pool.
+
+        Args:
+            engine: The engine used by the inline and thread modes.
+            model_path (str): The model path loaded by every process pool worker.
+            scaler_path (str): The scaler path loaded by every process pool worker.
+        """
+        self._engine = engine
+
+        if self.mode == "thread":
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.pool_size, thread_name_prefix="inference"
+            )
+        elif self.mode == "process":
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.pool_size,
+                initializer=_init_worker,
+                initargs=(model_path, scaler_path),
+            )
+        logger.info(
+            "Inference executor started in {} mode with {} workers",
+            self.mode,
+            self.pool_size if self._pool else 0,
+        )
+
+    def shutdown(self):
+        """
+        Shut down the worker pool, waiting for running tasks to finish.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        self._engine = None
+        logger.info("Inference executor has been shut down.")
+
+    async def run(self, fn: Callable, *args):
+        """
+        Run a function in the configured executor and await its result.
+        Process mode requires the function and its arguments to be picklable.
+        """
+        if self._pool is None:
+            return fn(*args)
+
+        loop = asyncio.get_running_loop()
+        if self.mode == "thread":
+            # Carry the current context over so spans started in the worker nest correctly
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(
+                self._pool, partial(context.run, fn, *args)
+            )
+        return await loop.run_in_executor(self._pool, partial(fn, *args))
+
+    async def score(self, features: NDArray[np.float64]) -> NDArray[np.float64]:
+        """
+        Score a preprocessed feature matrix with the bound engine.
+
+        Args:
+            features (NDArray[np.float64]): The N x D matrix of preprocessed records.
+
+        Returns:
+            NDArray[np.float64]: The positive class probability of every row.
+        """
+        if self.mode == "process":
+            return await self.run(_score_in_worker, features)
+        return await self.run(self._engine.predict_scores, features)
@@ -0,0 +1,42 @@
+from dto import PredictionResponse
+import numpy as np
+from numpy.typing import NDArray
+
+LOW_RISK_THRESHOLD = 0.33
+HIGH_RISK_THRESHOLD = 0.66
+
+
+def predict_scores(model, scaler, features: NDArray[np.float64]) -> NDArray[np.float64]:
+    """
+    Standardize a feature matrix and score it with a single model call.
+
+    Args:
+        model: The fitted classifier exposing predict_proba.
+        scaler: The fitted scaler exposing transform.
+        features (NDArray[np.float64]): The N x D matrix of preprocessed records.
+
+    Returns:
+        NDArray[np.float64]: The positive class probability of every row, in input order.
+    """
+    model_input = scaler.transform(features)
+    return model.predict_proba(model_input)[:, 1]
+
+
+def build_prediction_response(prediction: float) -> PredictionResponse:
+    """
+    Map a positive class probability to the risk level and score returned to clients.
+
+    Args:
+        prediction (float): The probability of a heart attack, between 0 and 1.
+
+    Returns:
+        PredictionResponse: The prediction result containing risk level and score.
+    """
+    return PredictionResponse(
+        risk_level="low_risk"
+        if prediction < LOW_RISK_THRESHOLD
+        else "medium_risk"
+        if prediction < HIGH_RISK_THRESHOLD
+        else "high_risk",
+        risk_score=round(prediction * 100.0, 2),
+    )
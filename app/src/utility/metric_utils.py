@@ -51,3 +51,50 @@ latency_hist = (
     if meter
     else None
 )
+
+batch_size_hist = (
+    meter.create_histogram(
+        name="micro_batch_size",
+        description="Histogram of the number of requests scored per micro-batch",
+        unit="requests",
+    )
+    if meter
+    else None
+)
+
+queue_wait_hist = (
+    meter.create_histogram(
+        name="micro_batch_queue_wait_seconds",
+        description="Histogram of the time requests wait in the micro-batching queue",
+        unit="seconds",
+    )
+    if meter
+    else None
+)
+
+cache_hits_counter = (
+    meter.create_counter(
+        name="prediction_cache_hits",
+        description="Total number of records served from the prediction cache",
+    )
+    if meter
+    else None
+)
+
+cache_misses_counter = (
+    meter.create_counter(
+        name="prediction_cache_misses",
+        description="Total number of records not found in the prediction cache",
+    )
+    if meter
+    else None
+)
+
+cache_evictions_counter = (
+    meter.create_counter(
+        name="prediction_cache_evictions",
+        description="Total number of entries removed from the prediction cache",
+    )
+    if meter
+    else None
+)
@@ -1,12 +1,20 @@
-from typing import Optional
+from typing import List, Optional
 from dto import PatientRecordDTO
 from sklearn.preprocessing import StandardScaler
 from loguru import logger
 import numpy as np
 from numpy.typing import NDArray
+import hashlib
 import joblib
+import os
+from .engine_utils import COMPILED_ENGINES, SklearnEngine, _scaler_moments
+from .inference_utils import build_prediction_response
 from .tracing_utils import trace_span
 
+PARITY_CORPUS_SIZE = 512
+PARITY_CHUNK_ROWS = 64
+PARITY_TOLERANCE = float(os.getenv("ENGINE_PARITY_TOLERANCE", "1e-12"))
+
 
 @trace_span("load_model")
 async def load_model(model_path: str) -> Optional[object]:
@@ -28,16 +36,115 @@ async def load_model(model_path: str) -> Optional[object]:
         raise RuntimeError(f"Model could not be loaded from {model_path}") from e
 
 
-@trace_span("preprocess_input")
-async def preprocess_input(input_data: PatientRecordDTO) -> NDArray[np.float64]:
+def artifact_version(*paths: str) -> str:
     """
-    Preprocess input data to ensure it matches the model's expected format.
+    Fingerprint artifact files from their path, size and modification time, so a
+    changed model or scaler can be detected without reading it.
 
     Args:
-        input_data (dict): The input data to preprocess.
+        *paths (str): The artifact file paths.
 
     Returns:
-        dict: The preprocessed input data.
+        str: A short hexadecimal fingerprint.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        except OSError:
+            digest.update(f"{path}:missing;".encode())
+    return digest.hexdigest()[:12]
+
+
+def build_parity_corpus(
+    scaler: StandardScaler, size: int = PARITY_CORPUS_SIZE, seed: int = 42
+) -> NDArray[np.float64]:
+    """
+    Build a deterministic feature matrix spread around the training distribution
+    recorded by the scaler, used to check compiled engines against sklearn.
+    """
+    mean, scale = _scaler_moments(scaler)
+    rng = np.random.default_rng(seed)
+    return mean + rng.standard_normal((size, mean.shape[0])) * 3.0 * scale
+
+
+def verify_engine_parity(candidate, reference, corpus: NDArray[np.float64]) -> bool:
+    """
+    Check that a compiled engine reproduces the reference engine on a corpus: scores
+    must agree within PARITY_TOLERANCE and every served response must be identical.
+    The candidate scores the corpus in serving-sized chunks, so engines that hand
+    large batches back to sklearn are checked on their own code path.
+    """
+    expected = reference.predict_scores(corpus)
+    actual = np.concatenate(
+        [
+            candidate.predict_scores(corpus[start : start + PARITY_CHUNK_ROWS])
+            for start in range(0, corpus.shape[0], PARITY_CHUNK_ROWS)
+        ]
+    )
+    if actual.shape != expected.shape or not np.all(np.isfinite(actual)):
+        return False
+
+    max_difference = float(np.max(np.abs(actual - expected)))
+    logger.info(
+        "Engine {} max score difference against {}: {}",
+        candidate.name,
+        reference.name,
+        max_difference,
+    )
+    if max_difference > PARITY_TOLERANCE:
+        return False
+
+    return all(
+        build_prediction_response(a) == build_prediction_response(e)
+        for a, e in zip(actual, expected)
+    )
+
+
+@trace_span("compile_engine")
+def compile_engine(model, scaler):
+    """
+    Pick the fastest scoring engine for a loaded model and scaler pair. A compiled
+    engine is only used when it matches the sklearn path on the parity corpus;
+    otherwise scoring falls back to scaler.transform and model.predict_proba.
+
+    Args:
+        model: The loaded model.
+        scaler: The loaded scaler.
+
+    Returns:
+        The engine exposing predict_scores(features).
+    """
+    reference = SklearnEngine(model, scaler)
+    if os.getenv("DISABLE_COMPILED_ENGINE", "false").lower() == "true":
+        logger.info("Compiled engines are disabled. Using the sklearn engine.")
+        return reference
+
+    for engine_cls in COMPILED_ENGINES:
+        if not engine_cls.supports(model, scaler):
+            continue
+
+        try:
+            candidate = engine_cls(model, scaler)
+            if verify_engine_parity(candidate, reference, build_parity_corpus(scaler)):
+                logger.info("Using compiled {} engine", candidate.name)
+                return candidate
+        except Exception as e:
+            logger.warning("Failed to compile {} engine: {}", engine_cls.name, e)
+            continue
+
+        logger.warning(
+            "Compiled {} engine does not match sklearn. Falling back.", engine_cls.name
+        )
+
+    logger.info("Using the sklearn engine for {}", type(model).__name__)
+    return reference
+
+
+def _encode_record(input_data: PatientRecordDTO) -> List[float]:
+    """
+    Convert a patient record into the ordered list of numerical features the model expects.
     """
     # Example preprocessing logic
     # This should be customized based on the model's requirements
@@ -54,7 +161,38 @@ async def preprocess_input(input_data: PatientRecordDTO) -> NDArray[np.float64]:
         if isinstance(preprocessed_input[key], int):
             preprocessed_input[key] = float(preprocessed_input[key])
 
+    return list(preprocessed_input.values())
+
+
+@trace_span("preprocess_input")
+async def preprocess_input(input_data: PatientRecordDTO) -> NDArray[np.float64]:
+    """
+    Preprocess input data to ensure it matches the model's expected format.
+
+    Args:
+        input_data (dict): The input data to preprocess.
+
+    Returns:
+        dict: The preprocessed input data.
+    """
     # Convert to numpy array
-    preprocessed_array = np.array(list(preprocessed_input.values())).reshape(1, -1)
+    preprocessed_array = np.array(_encode_record(input_data)).reshape(1, -1)
 
     return preprocessed_array
+
+
+@trace_span("preprocess_batch")
+def preprocess_batch(input_data: List[PatientRecordDTO]) -> NDArray[np.float64]:
+    """
+    Preprocess a list of patient records into a single feature matrix.
+    This is a plain function so large batches can run in the inference executor.
+
+    Args:
+        input_data (List[PatientRecordDTO]): The patient records to preprocess.
+
+    Returns:
+        NDArray[np.float64]: An N x D matrix with one row per record, in input order.
+    """
+    return np.array(
+        [_encode_record(record) for record in input_data], dtype=np.float64
+    ).reshape(len(input_data), -1)
@@ -0,0 +1,44 @@
+from typing import AsyncIterable, AsyncIterator, Tuple
+
+
+class LineTooLongError(ValueError):
+    """
+    Raised when a newline-delimited record exceeds the configured size limit.
+    """
+
+
+async def iter_ndjson_lines(
+    byte_stream: AsyncIterable[bytes], max_line_bytes: int
+) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Split an incoming byte stream into newline-delimited records without buffering
+    more than one partial line, so memory stays bounded by max_line_bytes.
+
+    Args:
+        byte_stream (AsyncIterable[bytes]): The raw request body chunks.
+        max_line_bytes (int): The largest accepted record, excluding the newline.
+
+    Yields:
+        Tuple[int, bytes]: The 1-based line number and content of every non-blank line.
+    """
+    pending = b""
+    line_number = 0
+
+    async for chunk in byte_stream:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if len(line) > max_line_bytes:
+                raise LineTooLongError(
+                    f"Line {line_number} exceeds {max_line_bytes} bytes"
+                )
+            if line.strip():
+                yield line_number, line
+        if len(pending) > max_line_bytes:
+            raise LineTooLongError(
+                f"Line {line_number + 1} exceeds {max_line_bytes} bytes"
+            )
+
+    if pending.strip():
+        yield line_number + 1, pending
@@ -1,3 +1,4 @@
+import asyncio
 from functools import wraps
 from opentelemetry import trace
 from loguru import logger
@@ -49,6 +50,19 @@ def trace_span(span_name: str):
     """
 
     def decorator(func):
+        if not asyncio.iscoroutinefunction(func):
+
+            @wraps(func)
+            def sync_wrapper(*args, **kwargs):
+                if not tracer:
+                    logger.info("Tracing is disabled. Skipping span creation.")
+                    return func(*args, **kwargs)
+
+                with tracer.start_as_current_span(span_name) as span:
+                    return func(*args, **kwargs)
+
+            return sync_wrapper
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
             if not tracer:
@@ -206,3 +206,256 @@ def test_runtime_error_while_hitting_request(mocker):
         )
     assert response.status_code == 500
     assert "Server Error" in response.json()["detail"]
+
+
+def test_predict_batch_endpoint_scores_records_in_one_call(mocker):
+    mocked_scaler = mocker.Mock()
+    mocked_model = mocker.Mock()
+    mocked_scaler.transform.side_effect = lambda features: features
+    mocked_model.predict_proba.return_value = np.array(
+        [[0.7, 0.3], [0.5, 0.5], [0.2, 0.8]]
+    )
+    return_map = {
+        MOCKED_MODEL_PATH: mocked_model,
+        MOCKED_SCALER_PATH: mocked_scaler,
+    }
+    mocker.patch("joblib.load", side_effect=lambda path: return_map[path])
+
+    records = [generate_random_patient_record().model_dump() for _ in range(3)]
+    with TestClient(app) as client:
+        response = client.post("/predict/batch", json=records)
+
+    assert response.status_code == 200
+    mocked_scaler.transform.assert_called_once()
+    mocked_model.predict_proba.assert_called_once()
+    assert mocked_scaler.transform.call_args[0][0].shape == (3, 9)
+    assert response.json() == [
+        {"risk_level": "low_risk", "risk_score": 30.0},
+        {"risk_level": "medium_risk", "risk_score": 50.0},
+        {"risk_level": "high_risk", "risk_score": 80.0},
+    ]
+
+
+def test_predict_batch_endpoint_with_empty_list(mocker):
+    mocked_load_model = mocker.patch("joblib.load", return_value=mocker.Mock())
+    with TestClient(app) as client:
+        response = client.post("/predict/batch", json=[])
+
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_predict_batch_endpoint_rejects_oversized_batch(mocker):
+    mocker.patch("joblib.load", return_value=mocker.Mock())
+    mocker.patch("src.main.MAX_BATCH_SIZE", 1)
+    records = [generate_random_patient_record().model_dump() for _ in range(2)]
+    with TestClient(app) as client:
+        response = client.post("/predict/batch", json=records)
+
+    assert response.status_code == 413
+
+
+def test_predict_batch_endpoint_with_bad_patient_record(mocker):
+    mocker.patch("joblib.load", return_value=mocker.Mock())
+    records = [generate_random_patient_record().model_dump() for _ in range(2)]
+    del records[1]["age"]
+    with TestClient(app) as client:
+        response = client.post("/predict/batch", json=records)
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "missing"
+
+
+def test_predict_batch_endpoint_runtime_error(mocker):
+    mocker.patch("joblib.load", return_value=mocker.Mock())
+    mocker.patch("src.main.preprocess_batch", side_effect=RuntimeError("Fake error"))
+    records = [generate_random_patient_record().model_dump()]
+    with TestClient(app, raise_server_exceptions=False) as client:
+        response = client.post("/predict/batch", json=records)
+
+    assert response.status_code == 500
+
+
+def test_predict_endpoint_with_micro_batching(mocker, monkeypatch):
+    monkeypatch.setenv("ENABLE_MICRO_BATCHING", "true")
+    monkeypatch.setenv("MICRO_BATCH_MAX_WAIT_MS", "0")
+    mocked_scaler = mocker.Mock()
+    mocked_model = mocker.Mock()
+    mocked_scaler.transform.side_effect = lambda features: features
+    mocked_model.predict_proba.return_value = np.array([[0.2, 0.8]])
+    return_map = {
+        MOCKED_MODEL_PATH: mocked_model,
+        MOCKED_SCALER_PATH: mocked_scaler,
+    }
+    mocker.patch("joblib.load", side_effect=lambda path: return_map[path])
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/predict",
+            content=generate_random_patient_record().model_dump_json(),
+            headers={"Content-Type": "application/json"},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {"risk_level": "high_risk", "risk_score": 80.0}
+    mocked_model.predict_proba.assert_called_once()
+
+
+@pytest.mark.parametrize("executor_mode", ["inline", "thread"])
+def test_predict_endpoint_with_executor_modes(mocker, monkeypatch, executor_mode):
+    monkeypatch.setenv("INFERENCE_EXECUTOR", executor_mode)
+    monkeypatch.setenv("INFERENCE_POOL_SIZE", "2")
+    mocked_scaler = mocker.Mock()
+    mocked_model = mocker.Mock()
+    mocked_scaler.transform.side_effect = lambda features: features
+    mocked_model.predict_proba.return_value = np.array([[0.9, 0.1]])
+    return_map = {
+        MOCKED_MODEL_PATH: mocked_model,
+        MOCKED_SCALER_PATH: mocked_scaler,
+    }
+    mocker.patch("joblib.load", side_effect=lambda path: return_map[path])
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/predict",
+            content=generate_random_patient_record().model_dump_json(),
+            headers={"Content-Type": "application/json"},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {"risk_level": "low_risk", "risk_score": 10.0}
+
+
+def test_predict_endpoint_serves_repeated_records_from_cache(mocker):
+    mocked_scaler = mocker.Mock()
+    mocked_model = mocker.Mock()
+    mocked_scaler.transform.side_effect = lambda features: features
+    mocked_model.predict_proba.return_value = np.array([[0.5, 0.5]])
+    return_map = {
+        MOCKED_MODEL_PATH: mocked_model,
+        MOCKED_SCALER_PATH: mocked_scaler,
+    }
+    mocker.patch("joblib.load", side_effect=lambda path: return_map[path])
+
+    patient_record = generate_random_patient_record().model_dump_json()
+    with TestClient(app) as client:
+        responses = [
+            client.post(
+                "/predict",
+                content=patient_record,
+                headers={"Content-Type": "application/json"},
+            )
+            for _ in range(3)
+        ]
+
+    assert all(response.status_code == 200 for response in responses)
+    assert all(response.json() == responses[0].json() for response in responses)
+    mocked_model.predict_proba.assert_called_once()
+
+
+def test_predict_batch_endpoint_only_scores_uncached_records(mocker):
+    mocked_scaler = mocker.Mock()
+    mocked_model = mocker.Mock()
+    mocked_scaler.transform.side_effect = lambda features: features
+    mocked_model.predict_proba.side_effect = lambda features: np.tile(
+        [0.9, 0.1], (features.shape[0], 1)
+    )
+    return_map = {
+        MOCKED_MODEL_PATH: mocked_model,
+        MOCKED_SCALER_PATH: mocked_scaler,
+    }
+    mocker.patch("joblib.load", side_effect=lambda path: return_map[path])
+
+    records = [generate_random_patient_record().model_dump() for _ in range(2)]
+    with TestClient(app) as client:
+        client.post("/predict", json=records[0])
+        response = client.post("/predict/batch", json=records)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert mocked_scaler.transform.call_args[0][0].shape == (1, 9)
+
+
+def test_predict_endpoint_without_cache(mocker, monkeypatch):
+    monkeypatch.setenv("PREDICTION_CACHE_MAX_ENTRIES", "0")
+    mocked_scaler = mocker.Mock()
+    mocked_model = mocker.Mock()
+    mocked_scaler.transform.side_effect = lambda features: features
+    mocked_model.predict_proba.return_value = np.array([[0.5, 0.5]])
+    return_map = {
+        MOCKED_MODEL_PATH: mocked_model,
+        MOCKED_SCALER_PATH: mocked_scaler,
+    }
+    mocker.patch("joblib.load", side_effect=lambda path: return_map[path])
+
+    patient_record = generate_random_patient_record().model_dump_json()
+    with TestClient(app) as client:
+        for _ in range(2):
+            client.post(
+                "/predict",
+                content=patient_record,
+                headers={"Content-Type": "application/json"},
+            )
+
+    assert mocked_model.predict_proba.call_count == 2
+
+
+def _ndjson(records) -> str:
+    return "\n".join(json.dumps(record) for record in records) + "\n"
+
+
+def test_predict_stream_endpoint_scores_records_in_chunks(mocker):
+    mocker.patch("src.main.STREAM_CHUNK_SIZE", 2)
+    mocked_scaler = mocker.Mock()
+    mocked_model = mocker.Mock()
+    mocked_scaler.transform.side_effect = lambda features: features
+    mocked_model.predict_proba.side_effect = lambda features: np.tile(
+        [0.2, 0.8], (features.shape[0], 1)
+    )
+    return_map = {
+        MOCKED_MODEL_PATH: mocked_model,
+        MOCKED_SCALER_PATH: mocked_scaler,
+    }
+    mocker.patch("joblib.load", side_effect=lambda path: return_map[path])
+
+    records = [generate_random_patient_record().model_dump() for _ in range(5)]
+    records[2]["sex"] = "unknown"
+    with TestClient(app) as client:
+        response = client.post(
+            "/predict/stream",
+            content=_ndjson(records) + "\n",
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 5
+    assert lines[2]["line"] == 3
+    assert lines[2]["detail"][0]["type"] == "string_pattern_mismatch"
+    for index in (0, 1, 3, 4):
+        assert lines[index] == {"risk_level": "high_risk", "risk_score": 80.0}
+    assert [call[0][0].shape[0] for call in mocked_scaler.transform.call_args_list] == [
+        2,
+        2,
+    ]
+
+
+def test_predict_stream_endpoint_rejects_oversized_lines(mocker):
+    mocker.patch("joblib.load", return_value=mocker.Mock())
+    mocker.patch("src.main.STREAM_MAX_LINE_BYTES", 16)
+    records = [generate_random_patient_record().model_dump()]
+    with TestClient(app) as client:
+        response = client.post("/predict/stream", content=_ndjson(records))
+
+    assert "exceeds 16 bytes" in response.json()["detail"]
+
+
+def test_predict_stream_endpoint_reports_runtime_errors(mocker):
+    mocker.patch("joblib.load", return_value=mocker.Mock())
+    mocker.patch("src.main.preprocess_batch", side_effect=RuntimeError("Fake error"))
+    records = [generate_random_patient_record().model_dump()]
+    with TestClient(app) as client:
+        response = client.post("/predict/stream", content=_ndjson(records))
+
+    assert response.json() == {"detail": "Server Error"}
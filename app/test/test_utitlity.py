@@ -1,4 +1,31 @@
-from src.utility import load_model, preprocess_input
+from src.utility import (
+    load_model,
+    preprocess_input,
+    preprocess_batch,
+    build_prediction_response,
+    MicroBatcher,
+    InferenceExecutor,
+    compile_engine,
+    build_parity_corpus,
+    verify_engine_parity,
+    SklearnEngine,
+    FusedLinearEngine,
+    TreeEnsembleEngine,
+    SVCEngine,
+    PredictionCache,
+    artifact_version,
+    iter_ndjson_lines,
+    LineTooLongError,
+)
+from sklearn.svm import SVC
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+from pathlib import Path
+import asyncio
+import threading
+
+MODEL_DIR = Path(__file__).resolve().parents[2] / "model"
 from src.dto import PatientRecordDTO
 import pytest
 import numpy as np
@@ -55,3 +82,458 @@ async def test_preprocess_input():
     ]
 
     np.testing.assert_allclose(actual_output[0], expected, rtol=1e-5)
+
+
+@pytest.mark.asyncio
+async def test_preprocess_batch_matches_preprocess_input():
+    patient_records = [
+        PatientRecordDTO(
+            age=45 + i,
+            sex="male" if i % 2 else "female",
+            total_cholesterol=200.0,
+            ldl_cholesterol=130.0,
+            hdl_cholesterol=50.0,
+            systolic_bp=120.0,
+            diastolic_bp=80.0,
+            is_smoker=bool(i % 2),
+            diabetes=False,
+        )
+        for i in range(4)
+    ]
+
+    actual_output = preprocess_batch(patient_records)
+
+    assert actual_output.shape == (4, 9)
+    assert actual_output.dtype == np.float64
+    for i, record in enumerate(patient_records):
+        np.testing.assert_array_equal(
+            actual_output[i], (await preprocess_input(record))[0]
+        )
+
+
+@pytest.mark.parametrize(
+    "prediction, expected_risk_level, expected_risk_score",
+    [
+        (0.1, "low_risk", 10.0),
+        (0.33, "medium_risk", 33.0),
+        (0.65999, "medium_risk", 66.0),
+        (0.66, "high_risk", 66.0),
+        (1.0, "high_risk", 100.0),
+    ],
+)
+def test_build_prediction_response(
+    prediction, expected_risk_level, expected_risk_score
+):
+    response = build_prediction_response(prediction)
+
+    assert response.risk_level == expected_risk_level
+    assert response.risk_score == expected_risk_score
+
+
+def _row_sum_scorer(calls):
+    async def score_fn(features):
+        calls.append(features.shape[0])
+        return features.sum(axis=1)
+
+    return score_fn
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_scores_concurrent_requests_together():
+    calls = []
+    batcher = MicroBatcher(_row_sum_scorer(calls), max_batch_size=8, max_wait_ms=50)
+    await batcher.start()
+
+    rows = [np.full((1, 9), float(i)) for i in range(5)]
+    scores = await asyncio.gather(*(batcher.submit(row) for row in rows))
+    await batcher.stop()
+
+    assert calls == [5]
+    assert scores == [9.0 * i for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_flushes_at_max_batch_size():
+    calls = []
+    batcher = MicroBatcher(_row_sum_scorer(calls), max_batch_size=2, max_wait_ms=50)
+    await batcher.start()
+
+    rows = [np.ones((1, 9)) for _ in range(5)]
+    scores = await asyncio.gather(*(batcher.submit(row) for row in rows))
+    await batcher.stop()
+
+    assert calls == [2, 2, 1]
+    assert scores == [9.0] * 5
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_propagates_scoring_errors():
+    async def failing_score_fn(features):
+        raise ValueError("scoring failed")
+
+    batcher = MicroBatcher(failing_score_fn, max_batch_size=4, max_wait_ms=1)
+    await batcher.start()
+
+    with pytest.raises(ValueError, match="scoring failed"):
+        await batcher.submit(np.ones((1, 9)))
+    await batcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_stop_fails_pending_requests():
+    scoring_started = asyncio.Event()
+
+    async def blocking_score_fn(features):
+        scoring_started.set()
+        await asyncio.Event().wait()
+
+    batcher = MicroBatcher(blocking_score_fn, max_batch_size=1, max_wait_ms=1)
+    await batcher.start()
+
+    inflight = asyncio.create_task(batcher.submit(np.ones((1, 9))))
+    queued = asyncio.create_task(batcher.submit(np.ones((1, 9))))
+    await scoring_started.wait()
+    await batcher.stop()
+
+    for pending in (inflight, queued):
+        with pytest.raises(RuntimeError, match="stopped"):
+            await pending
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_rejects_submit_when_not_running():
+    batcher = MicroBatcher(_row_sum_scorer([]), max_batch_size=4, max_wait_ms=1)
+
+    with pytest.raises(RuntimeError, match="not running"):
+        await batcher.submit(np.ones((1, 9)))
+
+
+@pytest.mark.parametrize("max_batch_size, max_wait_ms", [(0, 1), (4, -1)])
+def test_micro_batcher_rejects_invalid_configuration(max_batch_size, max_wait_ms):
+    with pytest.raises(ValueError):
+        MicroBatcher(_row_sum_scorer([]), max_batch_size, max_wait_ms)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["inline", "thread"])
+async def test_inference_executor_scores_with_bound_artifacts(mocker, mode):
+    mocked_scaler = mocker.Mock()
+    mocked_model = mocker.Mock()
+    mocked_scaler.transform.side_effect = lambda features: features
+    mocked_model.predict_proba.return_value = np.array([[0.4, 0.6], [0.9, 0.1]])
+
+    executor = InferenceExecutor(mode=mode, pool_size=2)
+    executor.start(
+        SklearnEngine(mocked_model, mocked_scaler), "model.pkl", "scaler.pkl"
+    )
+    scores = await executor.score(np.ones((2, 9)))
+    executor.shutdown()
+
+    np.testing.assert_array_equal(scores, [0.6, 0.1])
+    mocked_model.predict_proba.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_inference_executor_runs_off_the_event_loop_thread():
+    executor = InferenceExecutor(mode="thread", pool_size=1)
+    executor.start(None, "model.pkl", "scaler.pkl")
+    worker_thread = await executor.run(threading.get_ident)
+    executor.shutdown()
+
+    assert worker_thread != threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_inference_executor_process_mode_loads_artifacts_in_workers():
+    model_path = str(MODEL_DIR / "model.pkl")
+    scaler_path = str(MODEL_DIR / "scaler.pkl")
+    model = await load_model(model_path)
+    scaler = await load_model(scaler_path)
+    features = np.array([[45, 1, 200, 130, 50, 120, 80, 1, 0]], dtype=np.float64)
+
+    executor = InferenceExecutor(mode="process", pool_size=1)
+    executor.start(None, model_path, scaler_path)
+    scores = await executor.score(features)
+    executor.shutdown()
+
+    np.testing.assert_allclose(
+        scores, model.predict_proba(scaler.transform(features))[:, 1]
+    )
+
+
+def test_inference_executor_rejects_unknown_mode():
+    with pytest.raises(ValueError, match="Unknown executor mode"):
+        InferenceExecutor(mode="gpu")
+
+
+@pytest.fixture(scope="module")
+def production_artifacts():
+    import joblib
+
+    return joblib.load(MODEL_DIR / "model.pkl"), joblib.load(MODEL_DIR / "scaler.pkl")
+
+
+def test_compile_engine_fuses_logistic_regression(production_artifacts):
+    model, scaler = production_artifacts
+
+    engine = compile_engine(model, scaler)
+
+    assert isinstance(engine, FusedLinearEngine)
+    corpus = build_parity_corpus(scaler)
+    np.testing.assert_allclose(
+        engine.predict_scores(corpus),
+        model.predict_proba(scaler.transform(corpus))[:, 1],
+        rtol=0,
+        atol=1e-12,
+    )
+
+
+def test_fused_linear_engine_handles_extreme_logits():
+    rng = np.random.default_rng(0)
+    features = rng.standard_normal((200, 3))
+    scaler = StandardScaler(with_mean=False).fit(features)
+    model = LogisticRegression().fit(
+        scaler.transform(features), (features[:, 0] > 0).astype(int)
+    )
+
+    engine = FusedLinearEngine(model, scaler)
+    scores = engine.predict_scores(np.array([[1e6, 0.0, 0.0], [-1e6, 0.0, 0.0]]))
+
+    np.testing.assert_array_equal(scores, [1.0, 0.0])
+
+
+def test_compile_engine_falls_back_to_sklearn_for_unknown_models(mocker):
+    engine = compile_engine(mocker.Mock(), mocker.Mock())
+
+    assert isinstance(engine, SklearnEngine)
+
+
+def test_compile_engine_can_be_disabled(monkeypatch, production_artifacts):
+    monkeypatch.setenv("DISABLE_COMPILED_ENGINE", "true")
+    model, scaler = production_artifacts
+
+    assert isinstance(compile_engine(model, scaler), SklearnEngine)
+
+
+def test_compile_engine_falls_back_when_parity_fails(mocker, production_artifacts):
+    model, scaler = production_artifacts
+    mocker.patch.object(
+        FusedLinearEngine,
+        "predict_scores",
+        lambda self, features: np.full(features.shape[0], 0.5),
+    )
+
+    assert isinstance(compile_engine(model, scaler), SklearnEngine)
+
+
+def test_compile_engine_falls_back_when_compilation_fails(mocker, production_artifacts):
+    model, scaler = production_artifacts
+    mocker.patch.object(
+        FusedLinearEngine, "__init__", side_effect=ValueError("bad weights")
+    )
+
+    assert isinstance(compile_engine(model, scaler), SklearnEngine)
+
+
+def test_verify_engine_parity_rejects_non_finite_scores(mocker, production_artifacts):
+    model, scaler = production_artifacts
+    candidate = mocker.Mock()
+    candidate.predict_scores.side_effect = lambda features: np.full(
+        features.shape[0], np.nan
+    )
+    corpus = build_parity_corpus(scaler, size=8)
+
+    assert not verify_engine_parity(candidate, SklearnEngine(model, scaler), corpus)
+
+
+@pytest.fixture(scope="module")
+def training_data():
+    rng = np.random.default_rng(7)
+    features = rng.standard_normal((600, 9)) * 10.0 + 50.0
+    labels = features[:, 0] + features[:, 3] + rng.standard_normal(600) * 5 > 100
+    scaler = StandardScaler().fit(features)
+    return features, labels.astype(int), scaler
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        RandomForestClassifier(n_estimators=15, random_state=0),
+        GradientBoostingClassifier(n_estimators=20, random_state=0),
+        GradientBoostingClassifier(n_estimators=20, init="zero", random_state=0),
+    ],
+)
+def test_compile_engine_flattens_tree_ensembles(training_data, model):
+    features, labels, scaler = training_data
+    model.fit(scaler.transform(features), labels)
+
+    engine = compile_engine(model, scaler)
+
+    assert isinstance(engine, TreeEnsembleEngine)
+    np.testing.assert_allclose(
+        engine.predict_scores(features[:100]),
+        model.predict_proba(scaler.transform(features[:100]))[:, 1],
+        rtol=0,
+        atol=1e-12,
+    )
+
+
+def test_tree_ensemble_engine_hands_large_batches_to_sklearn(
+    mocker, monkeypatch, training_data
+):
+    monkeypatch.setenv("TREE_ENGINE_MAX_ROWS", "4")
+    features, labels, scaler = training_data
+    model = RandomForestClassifier(n_estimators=5, random_state=0)
+    model.fit(scaler.transform(features), labels)
+    engine = TreeEnsembleEngine(model, scaler)
+    reference_scores = mocker.spy(engine.reference, "predict_scores")
+
+    engine.predict_scores(features[:4])
+    reference_scores.assert_not_called()
+    engine.predict_scores(features[:5])
+    reference_scores.assert_called_once()
+
+
+def test_compile_engine_keeps_sklearn_for_unsupported_boosting_loss(training_data):
+    features, labels, scaler = training_data
+    model = GradientBoostingClassifier(
+        n_estimators=5, loss="exponential", random_state=0
+    )
+    model.fit(scaler.transform(features), labels)
+
+    assert isinstance(compile_engine(model, scaler), SklearnEngine)
+
+
+@pytest.mark.parametrize("first_label", [0, 1])
+def test_compile_engine_uses_svc_engine_for_rbf_svc(training_data, first_label):
+    features, labels, scaler = training_data
+    # libsvm orders classes internally, so train with either class first
+    order = np.argsort(labels != first_label, kind="stable")
+    model = SVC(probability=True, random_state=0)
+    model.fit(scaler.transform(features[order]), labels[order])
+
+    engine = compile_engine(model, scaler)
+
+    assert isinstance(engine, SVCEngine)
+    wide_features = np.vstack([features, build_parity_corpus(scaler, size=200)])
+    np.testing.assert_allclose(
+        engine.predict_scores(wide_features),
+        model.predict_proba(scaler.transform(wide_features))[:, 1],
+        rtol=0,
+        atol=1e-12,
+    )
+
+
+def test_compile_engine_keeps_sklearn_for_non_rbf_svc(training_data):
+    features, labels, scaler = training_data
+    model = SVC(kernel="linear", probability=True, random_state=0)
+    model.fit(scaler.transform(features), labels)
+
+    assert isinstance(compile_engine(model, scaler), SklearnEngine)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_prediction_cache_returns_hits_and_misses():
+    cache = PredictionCache(max_entries=10, ttl_seconds=60)
+    features = np.arange(18, dtype=np.float64).reshape(2, 9)
+    cache.put_many(features[:1], np.array([0.25]))
+
+    scores, missing = cache.get_many(features)
+
+    np.testing.assert_array_equal(missing, [False, True])
+    assert scores[0] == 0.25
+    assert np.isnan(scores[1])
+
+
+def test_prediction_cache_canonicalizes_negative_zero():
+    cache = PredictionCache(max_entries=10, ttl_seconds=60)
+    cache.put_many(np.zeros((1, 9)), np.array([0.5]))
+
+    scores, missing = cache.get_many(-np.zeros((1, 9)))
+
+    assert not missing.any()
+    assert scores[0] == 0.5
+
+
+def test_prediction_cache_evicts_least_recently_used_entries():
+    cache = PredictionCache(max_entries=2, ttl_seconds=60)
+    rows = np.eye(3, 9)
+    cache.put_many(rows[:2], np.array([0.1, 0.2]))
+    cache.get_many(rows[:1])  # touch the first row so the second becomes the oldest
+    cache.put_many(rows[2:], np.array([0.3]))
+
+    _, missing = cache.get_many(rows)
+
+    assert len(cache) == 2
+    np.testing.assert_array_equal(missing, [False, True, False])
+
+
+def test_prediction_cache_expires_entries_after_ttl():
+    clock = FakeClock()
+    cache = PredictionCache(max_entries=10, ttl_seconds=5, clock=clock)
+    cache.put_many(np.ones((1, 9)), np.array([0.7]))
+
+    clock.now = 4.9
+    assert not cache.get_many(np.ones((1, 9)))[1].any()
+    clock.now = 10.0
+    assert cache.get_many(np.ones((1, 9)))[1].all()
+    assert len(cache) == 0
+
+
+def test_prediction_cache_is_cleared_when_artifact_version_changes():
+    cache = PredictionCache(max_entries=10, ttl_seconds=60)
+    cache.bind("v1")
+    cache.put_many(np.ones((1, 9)), np.array([0.7]))
+
+    cache.bind("v1")
+    assert len(cache) == 1
+    cache.bind("v2")
+    assert len(cache) == 0
+
+
+def test_prediction_cache_rejects_invalid_size():
+    with pytest.raises(ValueError):
+        PredictionCache(max_entries=0, ttl_seconds=60)
+
+
+def test_artifact_version_changes_with_artifact_content(tmp_path):
+    artifact = tmp_path / "model.pkl"
+    artifact.write_bytes(b"first")
+    first_version = artifact_version(str(artifact), str(tmp_path / "missing.pkl"))
+
+    artifact.write_bytes(b"second artifact")
+
+    assert artifact_version(str(artifact), str(tmp_path / "missing.pkl")) != (
+        first_version
+    )
+
+
+async def _byte_chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_lines_reassembles_lines_across_chunks():
+    stream = _byte_chunks(b'{"a": 1}\n{"b"', b": 2}\n\n  \n", b'{"c": 3}')
+
+    lines = [line async for line in iter_ndjson_lines(stream, max_line_bytes=64)]
+
+    assert lines == [(1, b'{"a": 1}'), (2, b'{"b": 2}'), (5, b'{"c": 3}')]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "chunks", [(b"0123456789\n",), (b"0123456789",), (b"01234", b"56789")]
+)
+async def test_iter_ndjson_lines_bounds_line_length(chunks):
+    with pytest.raises(LineTooLongError):
+        async for _ in iter_ndjson_lines(_byte_chunks(*chunks), max_line_bytes=8):
+            pass